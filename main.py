@@ -4,284 +4,500 @@ Body Measurement Application with Blackish Theme and 3x Larger Processed Image
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
-import requests
-import base64
 from io import BytesIO
 import json
 import math
-from typing import List, Dict, Tuple, Optional
-from inference_sdk import InferenceHTTPClient
+import numpy as np
+from typing import List, Dict, Tuple, Optional, Iterator, TYPE_CHECKING
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from ttkbootstrap.style import Style
 from dotenv import load_dotenv
 import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # SIMD-accelerated drop-in replacement for the stdlib module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; the measurement kernel also runs as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+if TYPE_CHECKING:
+    # Pillow is imported where it is first used, keeping it off the startup path
+    from PIL import Image
 
 # Load environment variables from .env file
 load_dotenv()
 
+IMAGE_FILETYPES = [("Image files", "*.jpg *.jpeg *.png *.bmp *.gif *.tiff")]
+DEFAULT_BATCH_SIZE = 16
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".bodymetric_cache")
+CACHE_MAX_ENTRIES = 100
+MAX_UPLOAD_SIDE = 1280  # Larger images are downscaled before upload
+DISPLAY_CACHE_SIZE = 32  # Resized preview images kept in memory
+VISUALIZATION_CACHE_SIZE = 4  # Decoded full-size visualizations kept in memory
+MIN_KEYPOINT_CONFIDENCE = 0.0  # Keypoints below this confidence are treated as missing
+
+# Keypoint class ids emitted by the Roboflow model ('new-point-<id>')
+NUM_KEYPOINTS = 17
+(NOSE, R_EYE, L_EYE, R_EAR, L_EAR,
+ R_SHOULDER, L_SHOULDER, R_ELBOW, L_ELBOW, R_WRIST, L_WRIST,
+ R_HIP, L_HIP, R_KNEE, L_KNEE, R_ANKLE, L_ANKLE) = range(NUM_KEYPOINTS)
+
+# Body part names indexed by class id
+BODY_PARTS = (
+    'Nose', 'Right Eye', 'Left Eye', 'Right Ear', 'Left Ear',
+    'Right Shoulder', 'Left Shoulder', 'Right Elbow', 'Left Elbow', 'Right Wrist', 'Left Wrist',
+    'Right Hip', 'Left Hip', 'Right Knee', 'Left Knee', 'Right Ankle', 'Left Ankle'
+)
+
 class KeypointMapper:
-    """Maps keypoint class names to body parts"""
-    
-    KEYPOINT_MAPPING = {
-        'new-point-0': 'Nose',
-        'new-point-1': 'Right Eye',
-        'new-point-2': 'Left Eye',
-        'new-point-3': 'Right Ear',
-        'new-point-4': 'Left Ear',
-        'new-point-5': 'Right Shoulder',
-        'new-point-6': 'Left Shoulder',
-        'new-point-7': 'Right Elbow',
-        'new-point-8': 'Left Elbow',
-        'new-point-9': 'Right Wrist',
-        'new-point-10': 'Left Wrist',
-        'new-point-11': 'Right Hip',
-        'new-point-12': 'Left Hip',
-        'new-point-13': 'Right Knee',
-        'new-point-14': 'Left Knee',
-        'new-point-15': 'Right Ankle',
-        'new-point-16': 'Left Ankle'
-    }
+    """Maps keypoint class names and ids to body parts (compatibility wrapper over BODY_PARTS)"""
+    
+    BODY_PARTS = BODY_PARTS
+    # Legacy lookup by class name ('new-point-<id>')
+    KEYPOINT_MAPPING = {f'new-point-{i}': name for i, name in enumerate(BODY_PARTS)}
+    REVERSE_MAPPING = {v: k for k, v in KEYPOINT_MAPPING.items()}
+    BODY_PART_IDS = {name: i for i, name in enumerate(BODY_PARTS)}
     
     @classmethod
     def get_body_part(cls, class_name: str) -> str:
         """Get body part name from class name"""
         return cls.KEYPOINT_MAPPING.get(class_name, class_name)
     
+    @classmethod
+    def get_body_part_by_id(cls, class_id: int) -> str:
+        """Get body part name from class id"""
+        return BODY_PARTS[class_id]
+    
     @classmethod
     def find_keypoint_by_part(cls, keypoints: List[Dict], body_part: str) -> Optional[Dict]:
-        """Find keypoint by body part name"""
-        for kp in keypoints:
-            if cls.get_body_part(kp['class']) == body_part:
-                return kp
-        return None
+        """Find keypoint by body part name, comparing integer class ids"""
+        class_id = cls.BODY_PART_IDS.get(body_part)
+        return next((kp for kp in keypoints if kp.get('class_id') == class_id), None)
+
+# Straight-line body segments as (label, keypoint a, keypoint b)
+SEGMENTS = (
+    ('Shoulder Width', L_SHOULDER, R_SHOULDER), ('Waist Width', L_HIP, R_HIP),
+    ('Left Arm Length', L_SHOULDER, L_WRIST), ('Right Arm Length', R_SHOULDER, R_WRIST),
+    ('Left Upper Arm', L_SHOULDER, L_ELBOW), ('Right Upper Arm', R_SHOULDER, R_ELBOW),
+    ('Left Forearm', L_ELBOW, L_WRIST), ('Right Forearm', R_ELBOW, R_WRIST),
+    ('Left Leg Length', L_HIP, L_ANKLE), ('Right Leg Length', R_HIP, R_ANKLE),
+    ('Left Thigh', L_HIP, L_KNEE), ('Right Thigh', R_HIP, R_KNEE),
+    ('Left Shin', L_KNEE, L_ANKLE), ('Right Shin', R_KNEE, R_ANKLE),
+)
+SEGMENT_LABELS = tuple(label for label, _, _ in SEGMENTS)
+# Keypoint index pairs, one row per segment
+SEGMENT_TABLE = np.array([(a, b) for _, a, b in SEGMENTS], dtype=np.int64)
+N_SEGMENTS = len(SEGMENTS)
+# Order of the values returned by _compute_all: straight-line segments first,
+# then the composite measurements
+MEASUREMENT_NAMES = SEGMENT_LABELS + ('Arm Span', 'Height', 'Torso Length')
+N_MEASUREMENTS = len(MEASUREMENT_NAMES)
+ARM_SPAN, HEIGHT, TORSO_LENGTH = range(N_SEGMENTS, N_MEASUREMENTS)
+
+@njit(fastmath=True, cache=True)
+def _distance(coords, a, b):
+    """Euclidean distance between two keypoints in pixels"""
+    dx = coords[a, 0] - coords[b, 0]
+    dy = coords[a, 1] - coords[b, 1]
+    return math.sqrt(dx * dx + dy * dy)
+
+@njit(fastmath=True, cache=True)
+def _segment(coords, present, a, b, s):
+    """Distance between two keypoints in cm, NaN if either is missing"""
+    if present[a] and present[b]:
+        return _distance(coords, a, b) / s
+    return np.nan
+
+@njit(fastmath=True, cache=True)
+def _compute_all(coords, present, s):
+    """Compute every measurement in cm, in MEASUREMENT_NAMES order (NaN = unavailable)"""
+    out = np.full(N_MEASUREMENTS, np.nan, dtype=np.float32)
+    
+    for k in range(N_SEGMENTS):
+        out[k] = _segment(coords, present, SEGMENT_TABLE[k, 0], SEGMENT_TABLE[k, 1], s)
+    
+    # Arm span: both arms plus shoulder width, using whichever segments exist
+    span = 0.0
+    if present[L_SHOULDER] and present[L_ELBOW]:
+        span += _distance(coords, L_SHOULDER, L_ELBOW)
+    if present[L_ELBOW] and present[L_WRIST]:
+        span += _distance(coords, L_ELBOW, L_WRIST)
+    if present[R_SHOULDER] and present[R_ELBOW]:
+        span += _distance(coords, R_SHOULDER, R_ELBOW)
+    if present[R_ELBOW] and present[R_WRIST]:
+        span += _distance(coords, R_ELBOW, R_WRIST)
+    if present[L_SHOULDER] and present[R_SHOULDER]:
+        span += _distance(coords, L_SHOULDER, R_SHOULDER)
+    if span > 0:
+        out[ARM_SPAN] = span / s
+    
+    # Height: eyes to lowest ankle, plus the head above the eyes (2x eye-to-nose)
+    has_eye = present[L_EYE] or present[R_EYE]
+    eye_y = 0.0
+    if present[L_EYE] and present[R_EYE]:
+        eye_y = (coords[L_EYE, 1] + coords[R_EYE, 1]) / 2
+    elif present[L_EYE]:
+        eye_y = coords[L_EYE, 1]
+    elif present[R_EYE]:
+        eye_y = coords[R_EYE, 1]
+    if has_eye and (present[L_ANKLE] or present[R_ANKLE]):
+        if present[L_ANKLE] and present[R_ANKLE]:
+            ankle_y = max(coords[L_ANKLE, 1], coords[R_ANKLE, 1])
+        elif present[L_ANKLE]:
+            ankle_y = coords[L_ANKLE, 1]
+        else:
+            ankle_y = coords[R_ANKLE, 1]
+        head_top = 0.0
+        if present[NOSE]:
+            head_top = abs(eye_y - coords[NOSE, 1]) * 2.0
+        out[HEIGHT] = (abs(eye_y - ankle_y) + head_top) / s
+    
+    # Torso: vertical eye to hip, preferring the left side
+    eye = L_EYE if present[L_EYE] else R_EYE
+    hip = L_HIP if present[L_HIP] else R_HIP
+    if present[eye] and present[hip]:
+        out[TORSO_LENGTH] = abs(coords[eye, 1] - coords[hip, 1]) / s
+    
+    return out
+
+def warm_up_measurement_kernel():
+    """Compile (or load from Numba's on-disk cache) the kernel before the first analysis"""
+    _compute_all(np.zeros((NUM_KEYPOINTS, 2), dtype=np.float32), np.ones(NUM_KEYPOINTS, dtype=np.bool_), 1.0)
 
 class MeasurementCalculator:
     """Calculate various body measurements from keypoints"""
     
-    def __init__(self, keypoints: List[Dict], scale_ratio: float):
-        self.keypoints = keypoints
+    def __init__(self, coords: np.ndarray, present: np.ndarray, scale_ratio: float):
+        self.coords = coords
+        self.present = present
         self.scale_ratio = scale_ratio
-        self.mapper = KeypointMapper()
     
-    def calculate_distance(self, point1: Dict, point2: Dict) -> float:
-        """Calculate Euclidean distance between two points in pixels"""
-        return math.sqrt( 
-            (point1['x'] - point2['x'])**2 + 
-            (point1['y'] - point2['y'])**2
-        )
+    def calculate_distance(self, a: int, b: int) -> float:
+        """Calculate Euclidean distance between two keypoints in pixels"""
+        dx, dy = self.coords[a] - self.coords[b]
+        return math.sqrt(dx * dx + dy * dy)
     
     def pixels_to_cm(self, pixel_distance: float) -> float:
         """Convert pixel distance to centimeters"""
         return pixel_distance / self.scale_ratio
     
+    def get_eye_y(self) -> Optional[float]:
+        """Vertical eye position, averaged over both eyes when available"""
+        eyes = self.coords[[L_EYE, R_EYE], 1][self.present[[L_EYE, R_EYE]]]
+        if eyes.size:
+            return float(eyes.mean())
+        return None
+    
     def get_eye_distance(self) -> Optional[float]:
         """Calculate eye distance in pixels"""
-        left_eye = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Eye')
-        right_eye = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Eye')
-        
-        if left_eye and right_eye:
-            return self.calculate_distance(left_eye, right_eye)
+        if self.present[L_EYE] and self.present[R_EYE]:
+            return self.calculate_distance(L_EYE, R_EYE)
         return None
     
+    def get_head_top_to_eye_length(self) -> Optional[float]:
+        """Estimate vertical distance from top of head to eyes"""
+        eye_y = self.get_eye_y()
+        if eye_y is not None and self.present[NOSE]:
+            eye_to_nose_vertical_dist = abs(eye_y - float(self.coords[NOSE, 1]))
+            estimated_dist = eye_to_nose_vertical_dist * 2.0
+            return estimated_dist
+        return None
+    
+    def get_measurement(self, name: str) -> Optional[float]:
+        """Get a single measurement in cm by name"""
+        return self.get_all_measurements().get(name)
+    
     def get_shoulder_width(self) -> Optional[float]:
         """Calculate shoulder width in cm"""
-        left_shoulder = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Shoulder')
-        right_shoulder = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Shoulder')
-        
-        if left_shoulder and right_shoulder:
-            pixel_distance = self.calculate_distance(left_shoulder, right_shoulder)
-            return self.pixels_to_cm(pixel_distance)
-        return None
+        return self.get_measurement('Shoulder Width')
     
     def get_arm_span(self) -> Optional[float]:
         """Calculate arm span by summing arm segments and shoulder width"""
-        left_shoulder = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Shoulder')
-        left_elbow = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Elbow')
-        left_wrist = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Wrist')
-        right_shoulder = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Shoulder')
-        right_elbow = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Elbow')
-        right_wrist = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Wrist')
-
-        left_upper_arm = 0
-        if left_shoulder and left_elbow:
-            left_upper_arm = self.calculate_distance(left_shoulder, left_elbow)
-        left_forearm = 0
-        if left_elbow and left_wrist:
-            left_forearm = self.calculate_distance(left_elbow, left_wrist)
-        right_upper_arm = 0
-        if right_shoulder and right_elbow:
-            right_upper_arm = self.calculate_distance(right_shoulder, right_elbow)
-        right_forearm = 0
-        if right_elbow and right_wrist:
-            right_forearm = self.calculate_distance(right_elbow, right_wrist)
-        shoulder_width = 0
-        if left_shoulder and right_shoulder:
-            shoulder_width = self.calculate_distance(left_shoulder, right_shoulder)
-        
-        total_pixel_distance = left_upper_arm + left_forearm + right_upper_arm + right_forearm + shoulder_width
-        if total_pixel_distance > 0:
-            return self.pixels_to_cm(total_pixel_distance)
-        return None
+        return self.get_measurement('Arm Span')
     
-    def get_head_top_to_eye_length(self) -> Optional[float]:
-        """Estimate vertical distance from top of head to eyes"""
-        left_eye = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Eye')
-        right_eye = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Eye')
-        nose = self.mapper.find_keypoint_by_part(self.keypoints, 'Nose')
-
-        if (left_eye or right_eye) and nose:
-            eye_y = (left_eye['y'] + right_eye['y']) / 2 if left_eye and right_eye else (left_eye or right_eye)['y']
-            eye_to_nose_vertical_dist = abs(eye_y - nose['y'])
-            estimated_dist = eye_to_nose_vertical_dist * 2.0
-            return estimated_dist
-        return None
-
     def get_height(self) -> Optional[float]:
         """Calculate approximate height in cm, including estimated head height"""
-        left_eye = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Eye')
-        right_eye = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Eye')
-        left_ankle = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Ankle')
-        right_ankle = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Ankle')
-        
-        if (left_eye or right_eye) and (left_ankle or right_ankle):
-            eye_y = (left_eye['y'] + right_eye['y']) / 2 if left_eye and right_eye else (left_eye or right_eye)['y']
-            ankle_y = max(left_ankle['y'], right_ankle['y']) if left_ankle and right_ankle else (left_ankle or right_ankle)['y']
-            body_pixel_distance = abs(eye_y - ankle_y)
-            head_top_pixel_distance = self.get_head_top_to_eye_length() or 0
-            total_pixel_distance = body_pixel_distance + head_top_pixel_distance
-            return self.pixels_to_cm(total_pixel_distance)
-        return None
+        return self.get_measurement('Height')
     
     def get_waist_width(self) -> Optional[float]:
         """Calculate waist width in cm"""
-        left_hip = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Hip')
-        right_hip = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Hip')
-        
-        if left_hip and right_hip:
-            pixel_distance = self.calculate_distance(left_hip, right_hip)
-            return self.pixels_to_cm(pixel_distance)
-        return None
+        return self.get_measurement('Waist Width')
+    
+    def get_torso_length(self) -> Optional[float]:
+        """Calculate torso length (eye to hip, vertical) in cm"""
+        return self.get_measurement('Torso Length')
     
     def get_arm_length(self, side: str = 'Left') -> Optional[float]:
         """Calculate arm length (shoulder to wrist) in cm"""
-        shoulder = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Shoulder')
-        wrist = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Wrist')
-        
-        if shoulder and wrist:
-            pixel_distance = self.calculate_distance(shoulder, wrist)
-            return self.pixels_to_cm(pixel_distance)
-        return None
+        return self.get_measurement(f'{side} Arm Length')
     
     def get_forearm_length(self, side: str = 'Left') -> Optional[float]:
         """Calculate forearm length (elbow to wrist) in cm"""
-        elbow = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Elbow')
-        wrist = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Wrist')
-        
-        if elbow and wrist:
-            pixel_distance = self.calculate_distance(elbow, wrist)
-            return self.pixels_to_cm(pixel_distance)
-        return None
+        return self.get_measurement(f'{side} Forearm')
     
     def get_upper_arm_length(self, side: str = 'Left') -> Optional[float]:
         """Calculate upper arm length (shoulder to elbow) in cm"""
-        shoulder = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Shoulder')
-        elbow = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Elbow')
-        
-        if shoulder and elbow:
-            pixel_distance = self.calculate_distance(shoulder, elbow)
-            return self.pixels_to_cm(pixel_distance)
-        return None
+        return self.get_measurement(f'{side} Upper Arm')
     
     def get_leg_length(self, side: str = 'Left') -> Optional[float]:
         """Calculate leg length (hip to ankle) in cm"""
-        hip = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Hip')
-        ankle = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Ankle')
-        
-        if hip and ankle:
-            pixel_distance = self.calculate_distance(hip, ankle)
-            return self.pixels_to_cm(pixel_distance)
-        return None
+        return self.get_measurement(f'{side} Leg Length')
     
     def get_thigh_length(self, side: str = 'Left') -> Optional[float]:
         """Calculate thigh length (hip to knee) in cm"""
-        hip = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Hip')
-        knee = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Knee')
-        
-        if hip and knee:
-            pixel_distance = self.calculate_distance(hip, knee)
-            return self.pixels_to_cm(pixel_distance)
-        return None
+        return self.get_measurement(f'{side} Thigh')
     
     def get_shin_length(self, side: str = 'Left') -> Optional[float]:
         """Calculate shin length (knee to ankle) in cm"""
-        knee = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Knee')
-        ankle = self.mapper.find_keypoint_by_part(self.keypoints, f'{side} Ankle')
+        return self.get_measurement(f'{side} Shin')
+    
+    def get_all_measurements(self) -> Dict[str, float]:
+        """Calculate all available measurements"""
+        values = _compute_all(self.coords, self.present, float(self.scale_ratio))
+        return {name: float(v) for name, v in zip(MEASUREMENT_NAMES, values) if not np.isnan(v)}
+
+class LRUCache:
+    """In-memory mapping that drops the least recently used entries over maxsize"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+    
+    def get(self, key):
+        """Get the value for key, or None on a miss"""
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+    
+    def put(self, key, value):
+        """Store a value, evicting the oldest entries over the limit"""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+class InferenceCache:
+    """Disk cache of workflow results keyed by image content and workflow settings"""
+    
+    def __init__(self, directory: str = CACHE_DIR, max_entries: int = CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+    
+    @staticmethod
+    def hash_bytes(data: bytes, *context) -> str:
+        """Hash the image file contents together with the settings that shape the result"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in context:
+            digest.update(f"{part}\0".encode())
+        digest.update(data)
+        return digest.hexdigest()
+    
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Get the cached result for a key, or None on a miss"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as f:
+                result = json.load(f)
+            os.utime(path)  # Mark as recently used
+            return result
+        except (OSError, ValueError):
+            return None
+    
+    def set(self, key: str, result: Dict):
+        """Store a result, evicting the least recently used entries over the limit"""
+        path = self._entry_path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + '.tmp', 'w') as f:
+                json.dump(result, f)
+            os.replace(path + '.tmp', path)
+            
+            entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.json')]
+            if len(entries) > self.max_entries:
+                entries.sort(key=os.path.getmtime)
+                for old_path in entries[:len(entries) - self.max_entries]:
+                    os.remove(old_path)
+        except OSError as e:
+            print(f"Error writing inference cache: {e}")
+
+def open_image_for_display(fp, max_size: Tuple[int, int]) -> 'Image.Image':
+    """Open an image; JPEGs are decoded at the smallest DCT scale still covering max_size"""
+    from PIL import Image
+    image = Image.open(fp)
+    if image.format == 'JPEG':
+        image.draft(None, max_size)
+    return image
+
+def encode_image_for_upload(data: bytes) -> Tuple[str, float]:
+    """Base64-encode image file bytes for the workflow, downscaling very large images.
+    
+    Returns the payload and the factor mapping result coordinates back to the original image.
+    """
+    from PIL import Image
+    image = Image.open(BytesIO(data))
+    longest_side = max(image.size)
+    if longest_side <= MAX_UPLOAD_SIDE:
+        return base64.b64encode(data).decode('ascii'), 1.0
+    
+    original_width, original_height = image.size
+    scale = MAX_UPLOAD_SIDE / longest_side
+    target_size = (round(original_width * scale), round(original_height * scale))
+    if image.format == 'JPEG':
+        image.draft(None, target_size)  # Skip decoding pixels the resize would discard
+    small = image.convert('RGB').resize(target_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+    buffer = BytesIO()
+    # Keep EXIF so the orientation tag still applies to the downscaled image
+    small.save(buffer, format='JPEG', quality=90, exif=image.info.get('exif', b''))
+    return base64.b64encode(buffer.getvalue()).decode('ascii'), original_width / small.width
+
+def scale_predictions(result: Dict, factor: float):
+    """Scale pixel coordinates of a workflow result in place"""
+    predictions = result.get('predictions', {})
+    if not isinstance(predictions, dict):
+        return
+    for detection in predictions.get('predictions', []):
+        for key in ('x', 'y', 'width', 'height'):
+            if key in detection:
+                detection[key] *= factor
+        for keypoint in detection.get('keypoints', []):
+            keypoint['x'] *= factor
+            keypoint['y'] *= factor
+
+def decode_visualization(result) -> Optional['Image.Image']:
+    """Decode the keypoint visualization image of a workflow result"""
+    from PIL import Image
+    try:
+        vis_img = None
+        if isinstance(result, list) and result and isinstance(result[0], dict):
+            vis_data = result[0].get("keypoint_visualization")
+            
+            if vis_data:
+                if isinstance(vis_data, str) and vis_data.startswith("data:image"):
+                    base64_string = vis_data[vis_data.find(",") + 1:]
+                    img_data = base64.b64decode(base64_string)
+                    vis_img = Image.open(BytesIO(img_data))
+                elif isinstance(vis_data, str) and (vis_data.startswith("/9j/") or vis_data.startswith("iVBOR")):
+                    img_data = base64.b64decode(vis_data)
+                    vis_img = Image.open(BytesIO(img_data))
+                elif isinstance(vis_data, str) and vis_data.startswith("http"):
+                    import requests
+                    response = requests.get(vis_data, timeout=10)
+                    response.raise_for_status()
+                    vis_img = Image.open(BytesIO(response.content))
         
-        if knee and ankle:
-            pixel_distance = self.calculate_distance(knee, ankle)
-            return self.pixels_to_cm(pixel_distance)
-        return None
+        if vis_img:
+            vis_img.load()  # Image.open is lazy; decode the pixels here
+        return vis_img
     
-    def get_torso_length(self) -> Optional[float]:
-        """Calculate torso length (eye to hip, vertical) in cm"""
-        left_eye = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Eye')
-        right_eye = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Eye')
-        left_hip = self.mapper.find_keypoint_by_part(self.keypoints, 'Left Hip')
-        right_hip = self.mapper.find_keypoint_by_part(self.keypoints, 'Right Hip')
-        
-        if (left_eye or right_eye) and (left_hip or right_hip):
-            eye = left_eye if left_eye else right_eye
-            hip = left_hip if left_hip else right_hip
-            pixel_distance = abs(eye['y'] - hip['y'])
-            return self.pixels_to_cm(pixel_distance)
+    except Exception as e:
+        print(f"Error loading visualization: {e}")
         return None
+
+def parse_keypoints(result) -> Tuple[List[Dict], np.ndarray, np.ndarray, np.ndarray]:
+    """Extract keypoints from a Roboflow result.
     
-    def get_all_measurements(self) -> Dict[str, float]:
-        """Calculate all available measurements"""
-        measurements = {}
-        
-        measurements['Shoulder Width'] = self.get_shoulder_width()
-        measurements['Arm Span'] = self.get_arm_span()
-        measurements['Height'] = self.get_height()
-        measurements['Waist Width'] = self.get_waist_width()
-        measurements['Torso Length'] = self.get_torso_length()
-        
-        measurements['Left Arm Length'] = self.get_arm_length('Left')
-        measurements['Right Arm Length'] = self.get_arm_length('Right')
-        measurements['Left Upper Arm'] = self.get_upper_arm_length('Left')
-        measurements['Right Upper Arm'] = self.get_upper_arm_length('Right')
-        measurements['Left Forearm'] = self.get_forearm_length('Left')
-        measurements['Right Forearm'] = self.get_forearm_length('Right')
-        
-        measurements['Left Leg Length'] = self.get_leg_length('Left')
-        measurements['Right Leg Length'] = self.get_leg_length('Right')
-        measurements['Left Thigh'] = self.get_thigh_length('Left')
-        measurements['Right Thigh'] = self.get_thigh_length('Right')
-        measurements['Left Shin'] = self.get_shin_length('Left')
-        measurements['Right Shin'] = self.get_shin_length('Right')
-        
-        return {k: v for k, v in measurements.items() if v is not None}
+    Returns the keypoints in class order plus their coordinate, presence and confidence arrays.
+    """
+    keypoints = []
+    coords = np.full((NUM_KEYPOINTS, 2), np.nan, dtype=np.float32)
+    present = np.zeros(NUM_KEYPOINTS, dtype=bool)
+    confidences = np.zeros(NUM_KEYPOINTS, dtype=np.float32)
+    keypoints_by_class = [None] * NUM_KEYPOINTS
+    try:
+        if isinstance(result, list) and result:
+            outer_predictions = result[0].get('predictions', {})
+            person_detections = outer_predictions.get('predictions', [])
+            
+            if person_detections and isinstance(person_detections, list):
+                keypoints_list = person_detections[0].get('keypoints', [])
+                for keypoint in keypoints_list:
+                    if all(key in keypoint for key in ['class_id', 'class', 'x', 'y']):
+                        cid = keypoint['class_id']
+                        if cid is None or not 0 <= int(cid) < NUM_KEYPOINTS:
+                            continue
+                        cid = int(cid)
+                        coords[cid] = (keypoint['x'], keypoint['y'])
+                        present[cid] = True
+                        confidences[cid] = keypoint.get('confidence') or 0.0
+                        keypoints_by_class[cid] = {
+                            'class_id': cid,
+                            'class': keypoint.get('class'),
+                            'x': keypoint.get('x'),
+                            'y': keypoint.get('y'),
+                            'confidence': keypoint.get('confidence')
+                        }
+        
+        # Drop low-confidence keypoints from both the arrays and the list
+        present &= confidences >= MIN_KEYPOINT_CONFIDENCE
+        coords[~present] = np.nan
+        # Slotting by class id already leaves the list in class order
+        keypoints = [kp for kp in keypoints_by_class if kp is not None and present[kp['class_id']]]
+    
+    except Exception as e:
+        print(f"Error extracting keypoints: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    return keypoints, coords, present, confidences
+
+def measure_keypoints(keypoints: List[Dict], coords: np.ndarray, present: np.ndarray,
+                      eye_distance_real: float) -> Tuple[Dict[str, float], str, float, float]:
+    """Compute the scale and all measurements for a set of keypoints.
+    
+    Returns the measurements, the body part used as scale reference, its length in
+    pixels and the pixels/cm ratio; raises ValueError when the keypoints are insufficient.
+    """
+    if len(keypoints) < 2:
+        raise ValueError("Insufficient keypoints detected.\nPlease ensure a clear frontal view of a person.")
+    
+    calculator = MeasurementCalculator(coords, present, 1.0)
+    eye_distance_pixels = calculator.get_eye_distance()
+    
+    if eye_distance_pixels:
+        scale_ratio = eye_distance_pixels / eye_distance_real
+        reference_part = "Eye Distance"
+    else:
+        if present[L_SHOULDER] and present[R_SHOULDER]:
+            eye_distance_pixels = calculator.calculate_distance(L_SHOULDER, R_SHOULDER)
+            scale_ratio = eye_distance_pixels / eye_distance_real
+            reference_part = "Shoulder Width"
+        else:
+            raise ValueError("Unable to calculate scale: no eye or shoulder keypoints detected.\nPlease ensure a clear view of face or shoulders.")
+    
+    calculator.scale_ratio = scale_ratio
+    return calculator.get_all_measurements(), reference_part, eye_distance_pixels, scale_ratio
 
-def format_measurement_results(measurements: Dict[str, float]) -> List[Dict[str, str]]:
-    """Format measurement results as a list of dictionaries for table display"""
-    categories = {
-        'Overall': ['Height', 'Arm Span', 'Shoulder Width', 'Waist Width', 'Torso Length'],
-        'Arms': ['Left Arm Length', 'Right Arm Length', 'Left Upper Arm', 'Right Upper Arm', 'Left Forearm', 'Right Forearm'],
-        'Legs': ['Left Leg Length', 'Right Leg Length', 'Left Thigh', 'Right Thigh', 'Left Shin', 'Right Shin']
-    }
-    
-    result = []
-    for category, keys in categories.items():
+# Table layout: measurement names grouped by category, in display order
+MEASUREMENT_CATEGORIES = (
+    ('Overall', ('Height', 'Arm Span', 'Shoulder Width', 'Waist Width', 'Torso Length')),
+    ('Arms', ('Left Arm Length', 'Right Arm Length', 'Left Upper Arm', 'Right Upper Arm', 'Left Forearm', 'Right Forearm')),
+    ('Legs', ('Left Leg Length', 'Right Leg Length', 'Left Thigh', 'Right Thigh', 'Left Shin', 'Right Shin'))
+)
+
+def format_measurement_results(measurements: Dict[str, float]) -> Iterator[Tuple[str, str, str]]:
+    """Yield (category, measurement, value) rows for table display"""
+    for category, keys in MEASUREMENT_CATEGORIES:
         for key in keys:
             if key in measurements:
-                result.append({
-                    'Category': category,
-                    'Measurement': key,
-                    'Value': f"{measurements[key]:.1f} cm"
-                })
-    return result
+                yield category, key, f"{measurements[key]:.1f} cm"
 
 class BodyMeasurementApp:
     def __init__(self, root):
@@ -291,20 +507,43 @@ class BodyMeasurementApp:
         
         # Initialize variables
         self.original_image = None
+        self.image_paths = []
+        self._image_bytes = {}  # path -> file contents already read from disk
+        self._last_key = None  # (image paths, eye distance) of the last completed analysis
+        self._last_measurements = None  # (measurements, reference part) of that analysis
+        self._last_calc_key = None  # (keypoint hash, eye distance) behind _last_measurements
+        self._tree_rows = None  # Rows currently shown in results_tree (single-image view)
+        self._last_text_payload = None  # (text, tag, ...) chunks currently shown in keypoints_text
         self.processed_image = None
         self.eye_distance_pixels = None
         self.eye_distance_real = None
         self.keypoints = []
+        self.coords = np.full((NUM_KEYPOINTS, 2), np.nan, dtype=np.float32)
+        self.present = np.zeros(NUM_KEYPOINTS, dtype=bool)
+        self.confidences = np.zeros(NUM_KEYPOINTS, dtype=np.float32)
         self.scale_ratio = None
         self.results_expanded = True
         self.controls_expanded = True
-        self.image_panel_size = (600, 500)  # Initial size, updated dynamically
+        self.image_panel_size = {'original': (600, 500), 'processed': (600, 500)}  # Initial size, updated dynamically
+        self._resize_job = None
+        self._last_panel_size = None
+        self._rendered = {}  # image_type -> (source image, target size) currently displayed
+        self._photos = {}  # image_type -> reusable ImageTk.PhotoImage
+        self._label_states = {}  # image_type -> (photo, text) the label currently shows
+        self._source_keys = {}  # image_type -> content key of the image shown
+        self._display_cache = LRUCache(DISPLAY_CACHE_SIZE)  # (content key, size) -> resized image
+        self._vis_cache = LRUCache(VISUALIZATION_CACHE_SIZE)  # result key -> decoded visualization
         
-        # Initialize Roboflow client
-        self.client = InferenceHTTPClient(
-            api_url="https://serverless.roboflow.com",
-            api_key=os.getenv("ROBOFLOW_API_KEY")
-        )
+        # Worker threads for network calls, so the Tk main loop never blocks
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        self._closing = False  # Set once the window is closed; late results are dropped
+        # Initialize Roboflow client in the background; importing inference_sdk is slow
+        self._client_future = self._pool.submit(self._create_client)
+        self.cache = InferenceCache()
+        # Warm up the serverless workflow and the measurement kernel while the user
+        # picks an image; daemon threads keep the workers free and never delay exit
+        threading.Thread(target=self.warm_up_workflow, daemon=True).start()
+        threading.Thread(target=warm_up_measurement_kernel, daemon=True).start()
         
         # Configure style
         self.style = Style(theme='superhero')
@@ -323,6 +562,7 @@ class BodyMeasurementApp:
         self.style.configure('info.Horizontal.TProgressbar', troughcolor='#2c2c2c', background='#17a2b8')
         
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def setup_ui(self):
         # Main frame
@@ -351,16 +591,24 @@ class BodyMeasurementApp:
         
         # Image upload
         ttk.Label(self.controls_frame, text="Upload Image", font=('Segoe UI', 10)).grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
-        ttk.Button(self.controls_frame, text="Select Image", command=self.select_image, style='primary.TButton', width=15).grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        self.select_button = ttk.Button(self.controls_frame, text="Select Image", command=self.select_image, style='primary.TButton', width=15)
+        self.select_button.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
+        self.select_multiple_button = ttk.Button(self.controls_frame, text="Select Multiple Images", command=self.select_images, style='primary.Outline.TButton', width=15)
+        self.select_multiple_button.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         
         # Eye distance input
-        ttk.Label(self.controls_frame, text="Eye Distance (cm)", font=('Segoe UI', 10)).grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Label(self.controls_frame, text="Eye Distance (cm)", font=('Segoe UI', 10)).grid(row=3, column=0, sticky=tk.W, pady=(0, 5))
         self.eye_distance_var = tk.StringVar()
-        ttk.Entry(self.controls_frame, textvariable=self.eye_distance_var, width=10, style='info.TEntry').grid(row=3, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        ttk.Entry(self.controls_frame, textvariable=self.eye_distance_var, width=10, style='info.TEntry').grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        # Batch size input (images per workflow request)
+        ttk.Label(self.controls_frame, text="Batch Size", font=('Segoe UI', 10)).grid(row=5, column=0, sticky=tk.W, pady=(0, 5))
+        self.batch_size_var = tk.StringVar(value=str(DEFAULT_BATCH_SIZE))
+        ttk.Entry(self.controls_frame, textvariable=self.batch_size_var, width=10, style='info.TEntry').grid(row=6, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         
         # Analyze button
         self.analyze_button = ttk.Button(self.controls_frame, text="Analyze", command=self.process_image, style='success.TButton', width=15)
-        self.analyze_button.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        self.analyze_button.grid(row=7, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
         
         # Results section (collapsible)
         results_header = ttk.Frame(left_panel)
@@ -389,10 +637,13 @@ class BodyMeasurementApp:
         self.results_frame.columnconfigure(0, weight=1)
         
         # Keypoints text
-        self.keypoints_text = tk.Text(self.results_frame, height=10, width=40, font=('Segoe UI', 9), wrap=tk.WORD, bg='#212529', fg='#ffffff', bd=0)
+        self.keypoints_text = tk.Text(self.results_frame, height=10, width=40, font=('Segoe UI', 9), wrap=tk.WORD, bg='#212529', fg='#ffffff', bd=0, state='disabled')
         self.keypoints_text.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
         keypoints_scrollbar = ttk.Scrollbar(self.results_frame, orient="vertical", command=self.keypoints_text.yview, style='primary.Vertical.TScrollbar')
         self.keypoints_text.configure(yscrollcommand=keypoints_scrollbar.set)
+        self.keypoints_text.tag_configure('header', font=('Segoe UI', 10, 'bold'), foreground='#0d6efd')
+        self.keypoints_text.tag_configure('item', font=('Segoe UI', 9))
+        self.keypoints_text.tag_configure('error', foreground='#dc3545')
         keypoints_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
         
         # Right panel for images
@@ -424,9 +675,22 @@ class BodyMeasurementApp:
         self.image_panel.bind('<Configure>', self.update_image_panel_size)
     
     def update_image_panel_size(self, event=None):
+        """Schedule an image resize, coalescing bursts of <Configure> events"""
+        if self._resize_job:
+            self.root.after_cancel(self._resize_job)
+        self._resize_job = self.root.after(50, self._do_resize)
+    
+    def _do_resize(self):
         """Update the maximum image size based on the image panel's dimensions"""
+        self._resize_job = None
         panel_width = self.image_panel.winfo_width()
         panel_height = self.image_panel.winfo_height()
+        # Ignore jitter of a pixel or so
+        if self._last_panel_size:
+            last_width, last_height = self._last_panel_size
+            if abs(panel_width - last_width) < 2 and abs(panel_height - last_height) < 2:
+                return
+        self._last_panel_size = (panel_width, panel_height)
         # Account for padding and labels
         total_height = panel_height - 60  # Subtract padding and label heights
         # Allocate 1/4 height to original, 3/4 to processed (3x area)
@@ -465,43 +729,104 @@ class BodyMeasurementApp:
     def select_image(self):
         file_path = filedialog.askopenfilename(
             title="Select Image",
-            filetypes=[("Image files", "*.jpg *.jpeg *.png *.bmp *.gif *.tiff")]
+            filetypes=IMAGE_FILETYPES
         )
         
         if file_path:
             try:
-                self.original_image = Image.open(file_path)
-                self.image_path = file_path
+                with open(file_path, 'rb') as f:
+                    image_bytes = f.read()
+                self.original_image = open_image_for_display(BytesIO(image_bytes), self.screen_size())
+                self.image_paths = [file_path]
+                self._image_bytes = {file_path: image_bytes}
+                self._source_keys['original'] = (file_path, os.path.getmtime(file_path))
+                self._last_key = None
                 self.update_original_image()
                 self.status_var.set(f"Image loaded: {file_path.split('/')[-1]}")
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load image: {str(e)}", parent=self.root, icon='error')
     
+    def select_images(self):
+        """Select several images to analyze in batched workflow requests"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select Images",
+            filetypes=IMAGE_FILETYPES
+        )
+        
+        if file_paths:
+            try:
+                # Preview the first image; the rest are only sent for analysis
+                self.original_image = open_image_for_display(file_paths[0], self.screen_size())
+                self.image_paths = list(file_paths)
+                self._image_bytes = {}
+                self._source_keys['original'] = (file_paths[0], os.path.getmtime(file_paths[0]))
+                self._last_key = None
+                self.update_original_image()
+                self.status_var.set(f"{len(file_paths)} images loaded")
+                
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to load image: {str(e)}", parent=self.root, icon='error')
+    
+    def screen_size(self) -> Tuple[int, int]:
+        """Largest size an image can be displayed at"""
+        return self.root.winfo_screenwidth(), self.root.winfo_screenheight()
+    
     def update_original_image(self):
         """Update the original image display to fit the panel"""
         if self.original_image:
-            display_img = self.resize_image_for_display(self.original_image, 'original')
-            photo = ImageTk.PhotoImage(display_img)
-            self.original_label.configure(image=photo, text="")
-            self.original_label.image = photo
+            self.show_image(self.original_label, self.original_image, 'original')
     
     def update_processed_image(self):
         """Update the processed image display to fit the panel"""
         if self.processed_image:
-            display_img = self.resize_image_for_display(self.processed_image, 'processed')
+            self.show_image(self.processed_label, self.processed_image, 'processed')
+    
+    def show_image(self, label, image, image_type):
+        """Display image in label, skipping the resize if it is already shown at this size"""
+        size = self.image_panel_size[image_type]
+        rendered = self._rendered.get(image_type)
+        if rendered and rendered[0] is image and rendered[1] == size:
+            return
+        # Resized copies are cached by content, so re-showing an image at a size seen before is free
+        cache_key = (self._source_keys.get(image_type), size)
+        display_img = self._display_cache.get(cache_key) if cache_key[0] else None
+        if display_img is None:
+            display_img = self.resize_image_for_display(image, image_type)
+            if cache_key[0]:
+                self._display_cache.put(cache_key, display_img)
+        # Paste into the existing Tk photo when possible instead of allocating a new one
+        photo = self._photos.get(image_type)
+        if photo is not None and photo.width() == display_img.width and photo.height() == display_img.height:
+            photo.paste(display_img)
+        else:
+            from PIL import ImageTk
             photo = ImageTk.PhotoImage(display_img)
-            self.processed_label.configure(image=photo, text="")
-            self.processed_label.image = photo
+            self._photos[image_type] = photo
+        self.set_label_image(label, image_type, photo)
+        self._rendered[image_type] = (image, size)
+    
+    def set_label_image(self, label, image_type, photo, text=""):
+        """Configure an image label, skipping the Tcl call if it already shows this"""
+        state = self._label_states.get(image_type)
+        if state and state[0] is photo and state[1] == text:
+            return
+        # tkinter drops None-valued options, so clear the image with ''
+        label.configure(image=photo if photo is not None else '', text=text)
+        self._label_states[image_type] = (photo, text)
     
     def resize_image_for_display(self, image, image_type):
         """Resize image to fit within the image panel while maintaining aspect ratio"""
+        from PIL import Image
         img_width, img_height = image.size
         max_width, max_height = self.image_panel_size[image_type]
         scale = min(max_width / img_width, max_height / img_height)
-        new_width = int(img_width * scale)
-        new_height = int(img_height * scale)
-        return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Round down to multiples of 4 so Pillow-SIMD's vector loops need no scalar tail
+        new_width = max(4, int(img_width * scale) // 4 * 4)
+        new_height = max(4, int(img_height * scale) // 4 * 4)
+        # BILINEAR is indistinguishable from LANCZOS at preview sizes; reducing_gap
+        # lets Pillow shrink large photos with a fast integer reduce() first
+        return image.resize((new_width, new_height), Image.Resampling.BILINEAR, reducing_gap=2.0)
     
     def process_image(self):
         if not self.original_image:
@@ -520,22 +845,144 @@ class BodyMeasurementApp:
             messagebox.showerror("Error", "Please enter a valid positive number for eye distance", parent=self.root, icon='error')
             return
         
+        try:
+            batch_size = int(self.batch_size_var.get())
+            if batch_size <= 0:
+                raise ValueError("Batch size must be positive")
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid positive whole number for batch size", parent=self.root, icon='error')
+            return
+        
+        # Same image and eye distance as last time: the results cannot change
+        if (tuple(self.image_paths), self.eye_distance_real) == self._last_key and self._last_measurements:
+            self.display_results(*self._last_measurements)
+            self.status_var.set("Analysis complete")
+            return
+        
         self.status_var.set("Analyzing image...")
         self.progress.start(10)
-        self.analyze_button.configure(state='disabled')
-        self.root.update()
+        self.set_controls_state('disabled')
         
+        image_paths = list(self.image_paths)
+        future = self._pool.submit(self.analyze_images, image_paths, batch_size)
+        # Hand the result back to the Tk thread; widgets must not be touched from the worker
+        future.add_done_callback(lambda f: self._on_future_done(f, image_paths))
+    
+    def _on_future_done(self, future, image_paths):
+        """Schedule _handle_result on the Tk thread, unless the window is gone (worker thread)"""
+        if not self._closing:
+            self.root.after(0, self._handle_result, future, image_paths)
+    
+    def on_close(self):
+        """Drop pending work and close the window without waiting for running requests"""
+        self._closing = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+    
+    def set_controls_state(self, state):
+        """Enable or disable the buttons that start or change an analysis"""
+        # A new selection mid-request would show the old results under the new preview
+        for button in (self.select_button, self.select_multiple_button, self.analyze_button):
+            button.configure(state=state)
+    
+    @staticmethod
+    def _create_client():
+        """Create the Roboflow client (runs on a worker thread)"""
+        from inference_sdk import InferenceHTTPClient
+        return InferenceHTTPClient(
+            api_url="https://serverless.roboflow.com",
+            api_key=os.getenv("ROBOFLOW_API_KEY")
+        )
+    
+    @property
+    def client(self):
+        """Roboflow client, waiting for its background creation if needed"""
+        return self._client_future.result()
+    
+    def warm_up_workflow(self):
+        """Send a 1x1 image through the workflow so the first real request avoids the cold start"""
+        if not (os.getenv("ROBOFLOW_API_KEY") and os.getenv("ROBOFLOW_WORKSPACE") and os.getenv("ROBOFLOW_WORKFLOW_ID")):
+            return
         try:
-            result = self.client.run_workflow(
+            from PIL import Image
+            buffer = BytesIO()
+            Image.new('RGB', (1, 1)).save(buffer, format='PNG')
+            self.client.run_workflow(
                 workspace_name=os.getenv("ROBOFLOW_WORKSPACE"),
                 workflow_id=os.getenv("ROBOFLOW_WORKFLOW_ID"),
-                images={"image": self.image_path},
+                images={"image": base64.b64encode(buffer.getvalue()).decode('ascii')},
                 use_cache=True
             )
+        except Exception as e:
+            print(f"Debug: Workflow warm-up failed: {e}")
+    
+    def analyze_images(self, image_paths: List[str], batch_size: int) -> Tuple[List[Dict], Optional['Image.Image'], str]:
+        """Run inference and decode the visualization of the first image (worker thread).
+        
+        Returns the workflow results, the visualization and its result key.
+        """
+        results, keys = self.run_inference(image_paths, batch_size)
+        # The first image is the one previewed in the original panel
+        vis_key = keys[0]
+        vis_img = self._vis_cache.get(vis_key)
+        if vis_img is None:
+            vis_img = decode_visualization(results[:1])
+            if vis_img:
+                self._vis_cache.put(vis_key, vis_img)
+        # Save on cache hits too, so the file always matches the latest analysis
+        if vis_img:
+            vis_img.save("visualization_output.png")
+        return results, vis_img, vis_key
+    
+    def run_inference(self, image_paths: List[str], batch_size: int) -> Tuple[List[Dict], List[str]]:
+        """Run the workflow on each image, sending up to batch_size images per request.
+        
+        Images analyzed before are served from the disk cache without a request.
+        Returns the results and the cache key of each image.
+        """
+        images = []
+        for path in image_paths:
+            data = self._image_bytes.get(path)
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            images.append(data)
+        
+        # A different workflow or upload size must not be served from the old results
+        context = (os.getenv("ROBOFLOW_WORKSPACE"), os.getenv("ROBOFLOW_WORKFLOW_ID"), MAX_UPLOAD_SIDE)
+        keys = [InferenceCache.hash_bytes(data, *context) for data in images]
+        results = [self.cache.get(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        
+        for start in range(0, len(misses), batch_size):
+            batch = misses[start:start + batch_size]
+            uploads = [encode_image_for_upload(images[i]) for i in batch]
+            batch_results = self.client.run_workflow(
+                workspace_name=os.getenv("ROBOFLOW_WORKSPACE"),
+                workflow_id=os.getenv("ROBOFLOW_WORKFLOW_ID"),
+                images={"image": [payload for payload, _ in uploads]},
+                use_cache=True
+            )
+            for i, (_, factor), result in zip(batch, uploads, batch_results):
+                if factor != 1.0:
+                    scale_predictions(result, factor)
+                self.cache.set(keys[i], result)
+                results[i] = result
+        return results, keys
+    
+    def _handle_result(self, future, image_paths):
+        """Process a finished inference request on the main thread"""
+        self._last_key = None
+        try:
+            results, vis_img, vis_key = future.result()
             
-            self.extract_keypoints(result)
-            self.load_visualization(result)
-            self.calculate_measurements()
+            if len(image_paths) == 1:
+                self.extract_keypoints(results)
+                self.calculate_measurements()
+                self._last_key = (tuple(image_paths), self.eye_distance_real)
+            else:
+                self.display_batch_results(image_paths, results)
+            self.show_visualization(vis_img, vis_key)
             
             self.status_var.set("Analysis complete")
             
@@ -547,124 +994,121 @@ class BodyMeasurementApp:
             self.status_var.set("Analysis failed")
         
         self.progress.stop()
-        self.analyze_button.configure(state='normal')
+        self.set_controls_state('normal')
     
     def extract_keypoints(self, result):
         """Extract keypoints from Roboflow result"""
-        self.keypoints = []
-        try:
-            if isinstance(result, list) and result:
-                outer_predictions = result[0].get('predictions', {})
-                person_detections = outer_predictions.get('predictions', [])
-                
-                if person_detections and isinstance(person_detections, list):
-                    keypoints_list = person_detections[0].get('keypoints', [])
-                    for keypoint in keypoints_list:
-                        if all(key in keypoint for key in ['class_id', 'class', 'x', 'y']):
-                            self.keypoints.append({
-                                'class_id': keypoint.get('class_id'),
-                                'class': keypoint.get('class'),
-                                'x': keypoint.get('x'),
-                                'y': keypoint.get('y'),
-                                'confidence': keypoint.get('confidence')
-                            })
-            
-            self.keypoints.sort(key=lambda x: x['class_id'] if x.get('class_id') is not None else 999)
-            
-        except Exception as e:
-            print(f"Error extracting keypoints: {e}")
-            import traceback
-            traceback.print_exc()
+        self.keypoints, self.coords, self.present, self.confidences = parse_keypoints(result)
     
-    def load_visualization(self, result):
-        """Load and display the visualization image"""
-        try:
-            vis_img = None
-            if isinstance(result, list) and result and isinstance(result[0], dict):
-                vis_data = result[0].get("keypoint_visualization")
-                
-                if vis_data:
-                    if isinstance(vis_data, str) and vis_data.startswith("data:image"):
-                        base64_string = vis_data.split(",")[1] if "," in vis_data else vis_data
-                        img_data = base64.b64decode(base64_string)
-                        vis_img = Image.open(BytesIO(img_data))
-                    elif isinstance(vis_data, str) and (vis_data.startswith("/9j/") or vis_data.startswith("iVBOR")):
-                        img_data = base64.b64decode(vis_data)
-                        vis_img = Image.open(BytesIO(img_data))
-                    elif isinstance(vis_data, str) and vis_data.startswith("http"):
-                        response = requests.get(vis_data, timeout=10)
-                        response.raise_for_status()
-                        vis_img = Image.open(BytesIO(response.content))
-            
-            if vis_img:
-                self.processed_image = vis_img
-                self.update_processed_image()
-                vis_img.save("visualization_output.png")
-            else:
-                self.processed_label.configure(image=None, text="No processed image available")
-                self.processed_label.image = None
-                
-        except Exception as e:
-            print(f"Error loading visualization: {e}")
-            self.processed_label.configure(image=None, text="No processed image available")
-            self.processed_label.image = None
+    def show_visualization(self, vis_img, vis_key=None):
+        """Display the decoded visualization image"""
+        if vis_img:
+            self._source_keys['processed'] = vis_key
+            self.processed_image = vis_img
+            self.update_processed_image()
+        else:
+            # Forget the previous visualization so a resize does not draw it again
+            self.processed_image = None
+            self._source_keys.pop('processed', None)
+            self.set_label_image(self.processed_label, 'processed', None, "No processed image available")
+            self._rendered.pop('processed', None)
+    
+    def compute_measurements(self) -> Tuple[Dict[str, float], str]:
+        """Compute the scale and all measurements for the current keypoints.
+        
+        Returns the measurements and the body part used as scale reference;
+        raises ValueError when the keypoints are insufficient.
+        """
+        measurements, reference_part, self.eye_distance_pixels, self.scale_ratio = measure_keypoints(
+            self.keypoints, self.coords, self.present, self.eye_distance_real)
+        return measurements, reference_part
     
     def calculate_measurements(self):
         """Calculate body measurements based on keypoints and eye distance"""
-        if len(self.keypoints) < 2:
-            self.results_tree.delete(*self.results_tree.get_children())
-            self.keypoints_text.delete(1.0, tk.END)
-            self.keypoints_text.insert(tk.END, "Insufficient keypoints detected.\nPlease ensure a clear frontal view of a person.", 'error')
-            self.keypoints_text.tag_configure('error', foreground='#dc3545')
+        keypoint_hash = hashlib.blake2b(self.coords.tobytes() + self.present.tobytes(), digest_size=16).digest()
+        calc_key = (keypoint_hash, self.eye_distance_real)
+        if calc_key == self._last_calc_key and self._last_measurements:
+            self.display_results(*self._last_measurements)
             return
         
-        calculator = MeasurementCalculator(self.keypoints, 1.0)
-        self.eye_distance_pixels = calculator.get_eye_distance()
-        
-        if self.eye_distance_pixels:
-            self.scale_ratio = self.eye_distance_pixels / self.eye_distance_real
-            reference_part = "Eye Distance"
-        else:
-            left_shoulder = KeypointMapper.find_keypoint_by_part(self.keypoints, 'Left Shoulder')
-            right_shoulder = KeypointMapper.find_keypoint_by_part(self.keypoints, 'Right Shoulder')
-            if left_shoulder and right_shoulder:
-                self.eye_distance_pixels = calculator.calculate_distance(left_shoulder, right_shoulder)
-                self.scale_ratio = self.eye_distance_pixels / self.eye_distance_real
-                reference_part = "Shoulder Width"
-            else:
-                self.results_tree.delete(*self.results_tree.get_children())
-                self.keypoints_text.delete(1.0, tk.END)
-                self.keypoints_text.insert(tk.END, "Unable to calculate scale: no eye or shoulder keypoints detected.\nPlease ensure a clear view of face or shoulders.", 'error')
-                self.keypoints_text.tag_configure('error', foreground='#dc3545')
-                return
+        try:
+            measurements, reference_part = self.compute_measurements()
+        except ValueError as e:
+            self._last_measurements = None
+            self.clear_results_tree()
+            self.set_keypoints_text(str(e), 'error')
+            return
         
-        calculator.scale_ratio = self.scale_ratio
-        measurements = calculator.get_all_measurements()
+        self._last_measurements = (measurements, reference_part)
+        self._last_calc_key = calc_key
         self.display_results(measurements, reference_part)
     
-    def display_results(self, measurements, reference_part):
-        """Display measurement results in the table and keypoints in text"""
+    def clear_results_tree(self):
+        """Remove all rows from the results table"""
         self.results_tree.delete(*self.results_tree.get_children())
+        self._tree_rows = None
+    
+    def set_keypoints_text(self, *chunks):
+        """Replace the keypoints text with alternating text/tag chunks, unless already shown"""
+        if chunks == self._last_text_payload:
+            return
+        # The widget is read-only, so the remembered payload is always what it shows
+        self.keypoints_text.configure(state='normal')
         self.keypoints_text.delete(1.0, tk.END)
-        
+        # One Tcl call for the whole block; insert takes alternating text/tag pairs
+        self.keypoints_text.insert(tk.END, *chunks)
+        self.keypoints_text.configure(state='disabled')
+        self._last_text_payload = chunks
+    
+    def display_results(self, measurements, reference_part):
+        """Display measurement results in the table and keypoints in text"""
         # Display keypoints
-        self.keypoints_text.tag_configure('header', font=('Segoe UI', 10, 'bold'), foreground='#0d6efd')
-        self.keypoints_text.tag_configure('item', font=('Segoe UI', 9))
-        self.keypoints_text.insert(tk.END, f"Scale: {reference_part} ({self.eye_distance_real:.1f} cm, {self.eye_distance_pixels:.1f} pixels, {self.scale_ratio:.2f} pixels/cm)\n\n", 'header')
-        self.keypoints_text.insert(tk.END, "Detected Keypoints:\n", 'header')
-        mapper = KeypointMapper()
-        for i, kp in enumerate(self.keypoints):
-            body_part = mapper.get_body_part(kp['class'])
-            self.keypoints_text.insert(tk.END, f"{i+1}. {body_part}: ({kp['x']:.0f}, {kp['y']:.0f}) [Conf: {kp['confidence']:.3f}]\n", 'item')
-        
-        # Display measurements in table
-        formatted_results = format_measurement_results(measurements)
-        for item in formatted_results:
-            self.results_tree.insert('', tk.END, values=(item['Category'], item['Measurement'], item['Value']))
-        
+        header = (f"Scale: {reference_part} ({self.eye_distance_real:.1f} cm, {self.eye_distance_pixels:.1f} pixels, {self.scale_ratio:.2f} pixels/cm)\n\n"
+                  "Detected Keypoints:\n")
+        # Whole pixels are all the list shows, so round every coordinate in one go
+        pixels = np.rint(self.coords[self.present]).astype(np.int32).tolist()
+        confidences = self.confidences[self.present].tolist()
+        items = "".join([
+            f"{i+1}. {BODY_PARTS[kp['class_id']]}: ({x}, {y}) [Conf: {conf:.3f}]\n"
+            for i, (kp, (x, y), conf) in enumerate(zip(self.keypoints, pixels, confidences))
+        ])
+        chunks = (header, 'header', items, 'item')
         if not measurements:
-            self.keypoints_text.insert(tk.END, "\nNo measurements calculated.\nPlease ensure clear keypoints in the image.", 'error')
-            self.keypoints_text.tag_configure('error', foreground='#dc3545')
+            chunks += ("\nNo measurements calculated.\nPlease ensure clear keypoints in the image.", 'error')
+        self.set_keypoints_text(*chunks)
+        
+        # Display measurements in table, unless it already shows exactly these rows
+        rows = list(format_measurement_results(measurements))
+        if rows != self._tree_rows:
+            self.clear_results_tree()
+            insert = self.results_tree.insert
+            for row in rows:
+                insert('', tk.END, values=row)
+            self._tree_rows = rows
+    
+    def display_batch_results(self, image_paths, results):
+        """Measure every image of a batch and list the results per file"""
+        self.clear_results_tree()
+        
+        chunks = [f"Batch: {len(results)} images\n\n", 'header']
+        insert = self.results_tree.insert
+        for path, result in zip(image_paths, results):
+            filename = os.path.basename(path)
+            parent = insert('', tk.END, values=(filename, '', ''), open=True)
+            # Measure into locals; the single-image state stays untouched
+            keypoints, coords, present, _ = parse_keypoints([result])
+            try:
+                measurements, reference_part, _, scale_ratio = measure_keypoints(
+                    keypoints, coords, present, self.eye_distance_real)
+            except ValueError as e:
+                insert(parent, tk.END, values=('', 'Error', str(e).split('\n')[0]))
+                chunks += (f"{filename}: {e}\n", 'error')
+                continue
+            
+            for row in format_measurement_results(measurements):
+                insert(parent, tk.END, values=row)
+            chunks += (f"{filename}: {len(keypoints)} keypoints, scale from {reference_part} ({scale_ratio:.2f} pixels/cm)\n", 'item')
+        self.set_keypoints_text(*chunks)
 
 def main():
     root = ttk.Window(themename='superhero')